@@ -96,9 +96,14 @@ class BaseParallelProcessor(BaseProcessor):
 
     Args:
         max_workers (int): maximum number of workers that will be spawned
-            during the parallel processing.
+            during the parallel processing. If set to 1, data entries are
+            processed sequentially in the main process.
         chunksize (int): the size of the chunks that will be sent to worker processes
-            during the parallel processing.
+            during the parallel processing. If not specified, it is picked for each
+            ``in_memory_chunksize`` chunk of the manifest so that every worker gets
+            about 4 chunks, but no less than 64 and no more than 1000 data entries
+            per chunk. Small values make the inter-process communication overhead
+            dominate for processors with cheap per-entry work.
         in_memory_chunksize (int): the maximum number of input data entries that will
             be read, processed and saved at a time.
         test_cases (list[dict]): an optional list of dicts containing test
@@ -113,7 +118,7 @@ class BaseParallelProcessor(BaseProcessor):
     def __init__(
         self,
         max_workers: int = -1,
-        chunksize: int = 100,
+        chunksize: Optional[int] = None,
         in_memory_chunksize: int = 1000000,
         test_cases: Optional[List[Dict]] = None,
         **kwargs
@@ -158,7 +163,10 @@ class BaseParallelProcessor(BaseProcessor):
              and returns a list of dictionaries for each line (we assume a standard NeMo format
              of one json per line).
            * :meth:`process_dataset_entry` is called **in parallel** on each element
-             of the list created in the previous step. Note that you cannot create
+             of the list created in the previous step. If ``max_workers`` is 1 or
+             the whole ``manifest_chunk`` fits into a single ``chunksize`` chunk,
+             it is called sequentially in the main process instead, since there is
+             nothing to parallelize. Note that you cannot create
              any new counters or modify the attributes of this class in any way
              inside that function as this will lead to an undefined behavior.
              Each call to the :meth:`process_dataset_entry` returns a list of
@@ -185,15 +193,30 @@ class BaseParallelProcessor(BaseProcessor):
 
         with open(self.output_manifest_file, "wt", encoding="utf8") as fout:
             for manifest_chunk in self._chunk_manifest():
-                # this will unroll all inner lists
-                data = itertools.chain(
-                    *process_map(
-                        self.process_dataset_entry,
-                        manifest_chunk,
-                        max_workers=self.max_workers,
-                        chunksize=self.chunksize,
+                chunksize = self.chunksize
+                if chunksize is None:
+                    chunksize = max(64, min(1000, len(manifest_chunk) // (4 * self.max_workers)))
+                if self.max_workers == 1 or len(manifest_chunk) <= chunksize:
+                    # all entries would go to a single worker anyway, so spawning
+                    # processes and pickling the data would only add overhead
+                    logger.info("Processing %d data entries sequentially", len(manifest_chunk))
+                    data = itertools.chain.from_iterable(map(self.process_dataset_entry, manifest_chunk))
+                else:
+                    logger.info(
+                        "Processing %d data entries with %d workers and chunksize=%d",
+                        len(manifest_chunk),
+                        self.max_workers,
+                        chunksize,
+                    )
+                    # this will unroll all inner lists
+                    data = itertools.chain(
+                        *process_map(
+                            self.process_dataset_entry,
+                            manifest_chunk,
+                            max_workers=self.max_workers,
+                            chunksize=chunksize,
+                        )
                     )
-                )
                 for data_entry in tqdm(data):
                     metrics.append(data_entry.metrics)
                     if data_entry.data is None:
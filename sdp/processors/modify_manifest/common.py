@@ -1,7 +1,9 @@
 import json
 import os
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
+import numpy as np
+from omegaconf import DictConfig, OmegaConf
 from tqdm import tqdm
 
 from sdp.processors.base_processor import (
@@ -9,6 +11,58 @@ from sdp.processors.base_processor import (
     BaseProcessor,
     DataEntry,
 )
+from sdp.utils.common import iter_mmap_lines
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _is_lossy_orjson_value(value) -> bool:
+    """Checks if ``value`` might have been an integer that ``orjson`` parsed as a float.
+
+    ``orjson`` silently converts integers that don't fit into 64 bits to floats.
+    """
+    if isinstance(value, float):
+        return abs(value) >= 2**63
+    if isinstance(value, list):
+        return any(_is_lossy_orjson_value(item) for item in value)
+    if isinstance(value, dict):
+        return any(_is_lossy_orjson_value(item) for item in value.values())
+    return False
+
+
+def _json_loads(line: bytes, fields: Tuple[str, ...]) -> Dict:
+    """Parses a single manifest line, using ``orjson`` if it is installed.
+
+    Falls back to the standard ``json`` for anything ``orjson`` can't parse
+    exactly, e.g. ``NaN`` or ``Infinity`` values written by ``json.dump``,
+    or very large integers in any of the ``fields`` that the caller uses.
+    """
+    if orjson is not None:
+        try:
+            data_entry = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            pass
+        else:
+            for field in fields:
+                value = data_entry.get(field)
+                # strings are by far the most common and can be skipped right away
+                if type(value) is not str and _is_lossy_orjson_value(value):
+                    break
+            else:
+                return data_entry
+    return json.loads(line)
+
+
+def _json_dumps(data_entry: Dict) -> bytes:
+    """Serializes a manifest entry to utf-8 bytes.
+
+    Always uses the standard ``json`` to match the output of the other
+    processors (``orjson`` would e.g. silently write ``NaN`` as ``null``).
+    """
+    return json.dumps(data_entry, ensure_ascii=False).encode("utf8")
 
 
 class CombineSources(BaseParallelProcessor):
@@ -69,15 +123,21 @@ class CombineSources(BaseParallelProcessor):
         self.target = target
         self.na_indicator = na_indicator
 
+        # resolving source fields and the origin key once instead of on every entry
+        self._sources_plan = tuple((source_dict['field'], source_dict['origin_label']) for source_dict in sources)
+        self._origin_key = f"{target}_origin"
+
     def process_dataset_entry(self, data_entry: Dict):
-        for source_dict in self.sources:
-            if data_entry.get(source_dict['field'], self.na_indicator) != self.na_indicator:
-                data_entry[self.target] = data_entry[source_dict['field']]
-                data_entry[f"{self.target}_origin"] = source_dict['origin_label']
+        na_indicator = self.na_indicator
+        for field, origin_label in self._sources_plan:
+            value = data_entry.get(field, na_indicator)
+            if value != na_indicator:
+                data_entry[self.target] = value
+                data_entry[self._origin_key] = origin_label
                 break  # breaking out on the first present label
         else:  # going here if no break was triggered
-            data_entry[self.target] = self.na_indicator
-            data_entry[f"{self.target}_origin"] = self.na_indicator
+            data_entry[self.target] = na_indicator
+            data_entry[self._origin_key] = na_indicator
 
         return [DataEntry(data=data_entry)]
 
@@ -107,10 +167,14 @@ class AddConstantFields(BaseParallelProcessor):
         **kwargs,
     ):
         super().__init__(**kwargs)
-        self.fields = fields
+        # converting once to plain containers (including nested values), since Hydra
+        # passes config objects that are much slower to iterate over for every entry
+        if isinstance(fields, DictConfig):
+            fields = OmegaConf.to_container(fields, resolve=True)
+        self.fields = dict(fields)
 
     def process_dataset_entry(self, data_entry: Dict):
-        data_entry.update(self.fields)
+        data_entry |= self.fields
         return [DataEntry(data=data_entry)]
 
 
@@ -138,13 +202,14 @@ class DuplicateFields(BaseParallelProcessor):
     ):
         super().__init__(**kwargs)
         self.duplicate_fields = duplicate_fields
+        self._field_pairs = tuple(duplicate_fields.items())
 
     def process_dataset_entry(self, data_entry: Dict):
-        for field_src, field_tgt in self.duplicate_fields.items():
-            if not field_src in data_entry:
-                raise ValueError(f"Expected field {field_src} in data_entry {data_entry} but there isn't one.")
-
-            data_entry[field_tgt] = data_entry[field_src]
+        try:
+            for field_src, field_tgt in self._field_pairs:
+                data_entry[field_tgt] = data_entry[field_src]
+        except KeyError as e:
+            raise ValueError(f"Expected field {e.args[0]} in data_entry {data_entry} but there isn't one.") from e
 
         return [DataEntry(data=data_entry)]
 
@@ -168,14 +233,14 @@ class RenameFields(BaseParallelProcessor):
     ):
         super().__init__(**kwargs)
         self.rename_fields = rename_fields
+        self._field_pairs = tuple(rename_fields.items())
 
     def process_dataset_entry(self, data_entry: Dict):
-        for field_src, field_tgt in self.rename_fields.items():
-            if not field_src in data_entry:
-                raise ValueError(f"Expected field {field_src} in data_entry {data_entry} but there isn't one.")
-
-            data_entry[field_tgt] = data_entry[field_src]
-            del data_entry[field_src]
+        try:
+            for field_src, field_tgt in self._field_pairs:
+                data_entry[field_tgt] = data_entry.pop(field_src)
+        except KeyError as e:
+            raise ValueError(f"Expected field {e.args[0]} in data_entry {data_entry} but there isn't one.") from e
 
         return [DataEntry(data=data_entry)]
 
@@ -219,22 +284,18 @@ class SplitOnFixedDuration(BaseParallelProcessor):
     def process_dataset_entry(self, data_entry: Dict):
         total_duration = data_entry["duration"]
         total_segments = int(total_duration // self.segment_duration)
-        output = [None] * total_segments
-        for segment_idx in range(total_segments):
-            modified_entry = data_entry.copy()  # shallow copy should be good enough
-            modified_entry["duration"] = self.segment_duration
-            modified_entry["offset"] = segment_idx * self.segment_duration
-            if self.drop_text:
-                modified_entry.pop("text", None)
-            output[segment_idx] = DataEntry(data=modified_entry)
+        # letting numpy infer the dtype keeps offsets of the same type as segment_duration
+        offsets = (np.arange(total_segments) * self.segment_duration).tolist()
+        # all segments share a single template, only the offset is set per segment
+        base_entry = data_entry.copy()
+        if self.drop_text:
+            base_entry.pop("text", None)
+        base_entry["duration"] = self.segment_duration
+        output = [DataEntry(data={**base_entry, "offset": offset}) for offset in offsets]
 
         remainder = total_duration - self.segment_duration * total_segments
         if not self.drop_last and remainder > 0:
-            modified_entry = data_entry.copy()
-            modified_entry["duration"] = remainder
-            modified_entry["offset"] = self.segment_duration * total_segments
-            if self.drop_text:
-                modified_entry.pop("text", None)
+            modified_entry = {**base_entry, "duration": remainder, "offset": self.segment_duration * total_segments}
             output.append(DataEntry(data=modified_entry))
 
         return output
@@ -259,9 +320,16 @@ class ChangeToRelativePath(BaseParallelProcessor):
     ):
         super().__init__(**kwargs)
         self.base_dir = base_dir
+        self._abs_base_dir = os.path.abspath(base_dir).rstrip(os.sep) + os.sep
 
     def process_dataset_entry(self, data_entry: Dict):
-        data_entry["audio_filepath"] = os.path.relpath(data_entry["audio_filepath"], self.base_dir)
+        audio_filepath = os.path.normpath(data_entry["audio_filepath"])
+        # most paths are inside base_dir, so trimming the prefix is enough
+        # and we can skip the more expensive os.path.relpath call
+        if audio_filepath.startswith(self._abs_base_dir):
+            data_entry["audio_filepath"] = audio_filepath[len(self._abs_base_dir) :]
+        else:
+            data_entry["audio_filepath"] = os.path.relpath(audio_filepath, self.base_dir)
 
         return [DataEntry(data=data_entry)]
 
@@ -290,14 +358,32 @@ class SortManifest(BaseProcessor):
         self.descending = descending
 
     def process(self):
-        with open(self.input_manifest_file, "rt", encoding="utf8") as fin:
-            dataset_entries = [json.loads(line) for line in fin.readlines()]
-
-        dataset_entries = sorted(dataset_entries, key=lambda x: x[self.attribute_sort_by], reverse=self.descending)
-
-        with open(self.output_manifest_file, "wt", encoding="utf8") as fout:
-            for line in dataset_entries:
-                fout.write(json.dumps(line, ensure_ascii=False) + "\n")
+        # keeping the raw lines and only the sort key in memory, so that
+        # entries don't need to be re-serialized on the way out
+        keys, lines = [], []
+        for line in iter_mmap_lines(self.input_manifest_file):
+            keys.append(_json_loads(line, (self.attribute_sort_by,))[self.attribute_sort_by])
+            lines.append(line)
+
+        # numeric attributes (e.g. duration) are sorted much faster by numpy, as long as
+        # the keys can be converted without losing precision (and negated without overflow)
+        if all(isinstance(key, float) or (isinstance(key, int) and abs(key) <= 2**53) for key in keys):
+            numeric_keys = np.array(keys, dtype=np.float64)
+        elif all(isinstance(key, int) and abs(key) < 2**63 for key in keys):
+            numeric_keys = np.array(keys, dtype=np.int64)
+        else:
+            numeric_keys = None
+
+        if numeric_keys is not None:
+            # negating keys instead of reversing the order keeps the sort stable
+            order = np.argsort(-numeric_keys if self.descending else numeric_keys, kind="stable")
+        else:
+            order = sorted(range(len(keys)), key=keys.__getitem__, reverse=self.descending)
+
+        with open(self.output_manifest_file, "wb") as fout:
+            for idx in order:
+                line = lines[idx]
+                fout.write(line if line.endswith(b"\n") else line + b"\n")
 
 
 class KeepOnlySpecifiedFields(BaseProcessor):
@@ -319,12 +405,12 @@ class KeepOnlySpecifiedFields(BaseProcessor):
     def __init__(self, fields_to_keep: List[str], **kwargs):
         super().__init__(**kwargs)
         self.fields_to_keep = fields_to_keep
+        self._fields_to_keep = tuple(fields_to_keep)
 
     def process(self):
-        with open(self.input_manifest_file, "rt", encoding="utf8") as fin, open(
-            self.output_manifest_file, "wt", encoding="utf8"
-        ) as fout:
-            for line in tqdm(fin):
-                line = json.loads(line)
-                new_line = {field: line[field] for field in self.fields_to_keep}
-                fout.write(json.dumps(new_line, ensure_ascii=False) + "\n")
+        with open(self.output_manifest_file, "wb", buffering=1 << 20) as fout:
+            for line in tqdm(iter_mmap_lines(self.input_manifest_file)):
+                line = _json_loads(line, self._fields_to_keep)
+                new_line = {field: line[field] for field in self._fields_to_keep}
+                fout.write(_json_dumps(new_line))
+                fout.write(b"\n")
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mmap
 import os
+import stat
 import tarfile
 import urllib
 import zipfile
@@ -22,6 +24,37 @@ import wget
 from sdp.logging import logger
 
 
+def iter_mmap_lines(path: str):
+    """Yields lines of the file (as bytes, with line endings) by memory-mapping it.
+
+    Lines are read directly from the mapped file instead of going through
+    the buffered file reader, although each line is still copied into a
+    new ``bytes`` object. Files that can't be memory-mapped (e.g. empty
+    files or pipes) are read in the regular way.
+    """
+    with open(path, "rb") as fin:
+        file_stat = os.fstat(fin.fileno())
+        mm = None
+        # empty files, pipes and pseudo-files cannot be memory-mapped
+        if stat.S_ISREG(file_stat.st_mode) and file_stat.st_size > 0:
+            try:
+                mm = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                pass
+
+        if mm is None:  # falling back to regular buffered reading
+            yield from fin
+            return
+
+        with mm:
+            if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            line = mm.readline()
+            while line:
+                yield line
+                line = mm.readline()
+
+
 def download_file(source_url: str, target_directory: str, verbose = True):
     # make sure target_directory is an absolute path to avoid bugs when we change directories to download data later
     target_directory = os.path.abspath(target_directory)
@@ -25,7 +25,8 @@ import pytest
 from sdp.processors import DropNonAlphabet
 from sdp.processors import SubMakeLowercase
 
-def test_submakelowercase_with_chunking(tmp_path):
+@pytest.mark.parametrize("max_workers,chunksize", [(-1, None), (2, 1)])
+def test_submakelowercase_with_chunking(tmp_path, max_workers, chunksize):
 
 	input_lines = [
 		{"text": "ABC"},
@@ -63,7 +64,9 @@ def test_submakelowercase_with_chunking(tmp_path):
 	processor = SubMakeLowercase(
 		input_manifest_file=input_manifest_file,
 		output_manifest_file=output_manifest_file,
-		in_memory_chunksize=2
+		in_memory_chunksize=2,
+		max_workers=max_workers,
+		chunksize=chunksize,
 	)
 
 	processor.process()
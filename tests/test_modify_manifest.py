@@ -12,10 +12,240 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from sdp.processors import DropNonAlphabet
+import json
+import math
+
+import pytest
+from omegaconf import OmegaConf
+
+from sdp.processors import (
+    AddConstantFields,
+    ChangeToRelativePath,
+    CombineSources,
+    DropNonAlphabet,
+    DuplicateFields,
+    KeepOnlySpecifiedFields,
+    RenameFields,
+    SortManifest,
+    SplitOnFixedDuration,
+)
 
 
 def test_empty_test_cases():
     """Testing that empty test cases don't raise an error."""
     processor = DropNonAlphabet("123", output_manifest_file="tmp")
     processor.test()
+
+
+def _write_manifest(manifest_file, entries):
+    with open(manifest_file, "wt", encoding="utf8") as fout:
+        for entry in entries:
+            fout.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def _read_manifest(manifest_file):
+    with open(manifest_file, "rt", encoding="utf8") as fin:
+        return [json.loads(line) for line in fin]
+
+
+@pytest.mark.parametrize(
+    "attribute_sort_by,descending,expected_order",
+    [
+        ("duration", True, "bacd"),
+        ("duration", False, "dacb"),
+        # non-numeric attributes go through the regular python sort
+        ("text", True, "dbac"),
+        ("text", False, "acbd"),
+    ],
+)
+def test_sort_manifest(tmp_path, attribute_sort_by, descending, expected_order):
+    entries = [
+        {"audio_filepath": "a.wav", "duration": 2.5, "text": "c"},
+        {"audio_filepath": "b.wav", "duration": 10, "text": "d"},
+        {"audio_filepath": "c.wav", "duration": 2.5, "text": "c"},
+        {"audio_filepath": "d.wav", "duration": 0.5, "text": "ա"},
+    ]
+    input_manifest_file = tmp_path / "input_manifest.json"
+    _write_manifest(input_manifest_file, entries)
+
+    output_manifest_file = tmp_path / "output_manifest.json"
+    processor = SortManifest(
+        attribute_sort_by=attribute_sort_by,
+        descending=descending,
+        input_manifest_file=input_manifest_file,
+        output_manifest_file=output_manifest_file,
+    )
+    processor.process()
+
+    # entries with equal keys have to keep their original order
+    assert _read_manifest(output_manifest_file) == [entries["abcd".index(name)] for name in expected_order]
+
+
+@pytest.mark.parametrize(
+    "keys",
+    [
+        [2**53 + 1, 2**53, 2**53 + 2],  # int64 path, not representable exactly as float64
+        [2**53 + 1, 2**53, 0.5],  # mixed ints and floats that can't be converted exactly
+        [2**70 + 1, 2**70, -(2**63)],  # does not fit into int64 (or can't be negated)
+        [3, True, 2.5, -1],
+    ],
+)
+@pytest.mark.parametrize("descending", [True, False])
+def test_sort_manifest_numeric_precision(tmp_path, keys, descending):
+    entries = [{"audio_filepath": f"{idx}.wav", "id": key} for idx, key in enumerate(keys)]
+    input_manifest_file = tmp_path / "input_manifest.json"
+    _write_manifest(input_manifest_file, entries)
+
+    output_manifest_file = tmp_path / "output_manifest.json"
+    SortManifest(
+        attribute_sort_by="id",
+        descending=descending,
+        input_manifest_file=input_manifest_file,
+        output_manifest_file=output_manifest_file,
+    ).process()
+
+    assert _read_manifest(output_manifest_file) == sorted(entries, key=lambda x: x["id"], reverse=descending)
+
+
+def test_keep_only_specified_fields(tmp_path):
+    entries = [
+        {"audio_filepath": "a.wav", "duration": 2.5, "text": "ա բ", "pred_text": "a"},
+        {"audio_filepath": "b.wav", "duration": 1.0, "text": 'say "text": b\\', "pred_text": "b"},
+        {"audio_filepath": "c.wav", "duration": -1e-5, "text": None, "pred_text": "c"},
+        {'x"text': "a", "audio_filepath": "g.wav", "a,\"text": "b", "text": 0},
+        # entries which cannot be projected without parsing the whole line
+        {"audio_filepath": "d.wav", "meta": {"text": "nested"}, "text": "d"},
+        {"audio_filepath": "e.wav", "text": ["e", "f"]},
+        {"audio_filepath": "f.wav", "text": {"words": ["f"]}},
+    ]
+    input_manifest_file = tmp_path / "input_manifest.json"
+    _write_manifest(input_manifest_file, entries)
+
+    output_manifest_file = tmp_path / "output_manifest.json"
+    processor = KeepOnlySpecifiedFields(
+        fields_to_keep=["text", "audio_filepath"],
+        input_manifest_file=input_manifest_file,
+        output_manifest_file=output_manifest_file,
+    )
+    processor.process()
+
+    assert _read_manifest(output_manifest_file) == [
+        {"text": entry["text"], "audio_filepath": entry["audio_filepath"]} for entry in entries
+    ]
+
+
+def test_combine_sources():
+    processor = CombineSources(
+        sources=[
+            {"field": "text_pc", "origin_label": "original"},
+            {"field": "text_pc_pred", "origin_label": "synthetic"},
+        ],
+        target="text",
+        output_manifest_file="tmp",
+        test_cases=[
+            {
+                "input": {"text_pc": "Hello.", "text_pc_pred": "Hello!"},
+                "output": {"text_pc": "Hello.", "text_pc_pred": "Hello!", "text": "Hello.", "text_origin": "original"},
+            },
+            {
+                "input": {"text_pc": "n/a", "text_pc_pred": "Hello!"},
+                "output": {"text_pc": "n/a", "text_pc_pred": "Hello!", "text": "Hello!", "text_origin": "synthetic"},
+            },
+            {
+                "input": {"text_pc": "n/a"},
+                "output": {"text_pc": "n/a", "text": "n/a", "text_origin": "n/a"},
+            },
+        ],
+    )
+    processor.test()
+
+
+def test_rename_and_duplicate_fields():
+    renamer = RenameFields(rename_fields={"text": "text_pc", "pred": "pred_text"}, output_manifest_file="tmp")
+    assert renamer.process_dataset_entry({"text": "a", "pred": "b", "duration": 1})[0].data == {
+        "duration": 1,
+        "text_pc": "a",
+        "pred_text": "b",
+    }
+    with pytest.raises(ValueError, match="Expected field pred"):
+        renamer.process_dataset_entry({"text": "a"})
+
+    duplicator = DuplicateFields(duplicate_fields={"text": "text_no_pc"}, output_manifest_file="tmp")
+    assert duplicator.process_dataset_entry({"text": "a"})[0].data == {"text": "a", "text_no_pc": "a"}
+    with pytest.raises(ValueError, match="Expected field text"):
+        duplicator.process_dataset_entry({"pred_text": "a"})
+
+
+def test_change_to_relative_path():
+    processor = ChangeToRelativePath(base_dir="/data/dataset/", output_manifest_file="tmp")
+    for audio_filepath, expected in [
+        ("/data/dataset/audio/a.wav", "audio/a.wav"),
+        ("/data/dataset//audio/./b.wav", "audio/b.wav"),
+        ("/data/other/c.wav", "../other/c.wav"),
+    ]:
+        output = processor.process_dataset_entry({"audio_filepath": audio_filepath})[0].data
+        assert output["audio_filepath"] == expected
+
+
+@pytest.mark.parametrize("segment_duration,duration", [(2.0, 5.0), (2, 5)])
+def test_split_on_fixed_duration(segment_duration, duration):
+    processor = SplitOnFixedDuration(segment_duration=segment_duration, drop_last=False, output_manifest_file="tmp")
+    output = processor.process_dataset_entry({"audio_filepath": "a.wav", "duration": duration, "text": "abc"})
+    expected_output = [
+        {"audio_filepath": "a.wav", "duration": 2, "offset": 0},
+        {"audio_filepath": "a.wav", "duration": 2, "offset": 2},
+        {"audio_filepath": "a.wav", "duration": 1, "offset": 4},
+    ]
+    assert [entry.data for entry in output] == expected_output
+    # offsets and durations should have the same type as the inputs (e.g. no int -> float conversion)
+    for entry in output:
+        assert type(entry.data["offset"]) is type(segment_duration)
+        assert type(entry.data["duration"]) is type(segment_duration)
+
+
+def test_add_constant_fields():
+    # Hydra passes the fields as a DictConfig, possibly with nested configs inside
+    fields = OmegaConf.create({"label": "en", "metadata": {"source": "mcv", "tags": ["a", "b"]}})
+    processor = AddConstantFields(fields=fields, output_manifest_file="tmp")
+
+    output = processor.process_dataset_entry({"audio_filepath": "a.wav", "label": "es"})[0].data
+    assert output == {
+        "audio_filepath": "a.wav",
+        "label": "en",
+        "metadata": {"source": "mcv", "tags": ["a", "b"]},
+    }
+    assert type(output["metadata"]) is dict
+    assert type(output["metadata"]["tags"]) is list
+    json.dumps(output)
+
+
+def test_non_standard_json_values(tmp_path):
+    # json.dump (used to write all manifests) emits NaN/Infinity and arbitrarily large integers
+    entries = [
+        {"audio_filepath": "a.wav", "duration": 2.0, "wer": float("nan"), "id": 2**70 + 1},
+        {"audio_filepath": "b.wav", "duration": 1.0, "wer": float("inf"), "id": 2**70},
+    ]
+    input_manifest_file = tmp_path / "input_manifest.json"
+    _write_manifest(input_manifest_file, entries)
+
+    sorted_manifest_file = tmp_path / "sorted_manifest.json"
+    SortManifest(
+        attribute_sort_by="duration",
+        descending=False,
+        input_manifest_file=input_manifest_file,
+        output_manifest_file=sorted_manifest_file,
+    ).process()
+    sorted_entries = _read_manifest(sorted_manifest_file)
+    assert [entry["audio_filepath"] for entry in sorted_entries] == ["b.wav", "a.wav"]
+    assert math.isnan(sorted_entries[1]["wer"])
+
+    projected_manifest_file = tmp_path / "projected_manifest.json"
+    KeepOnlySpecifiedFields(
+        fields_to_keep=["wer", "id"],
+        input_manifest_file=input_manifest_file,
+        output_manifest_file=projected_manifest_file,
+    ).process()
+    projected_entries = _read_manifest(projected_manifest_file)
+    assert math.isnan(projected_entries[0]["wer"])
+    assert projected_entries[1]["wer"] == float("inf")
+    assert [entry["id"] for entry in projected_entries] == [2**70 + 1, 2**70]
@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import threading
+
 import pytest
 
+from sdp.utils.common import iter_mmap_lines
 from sdp.utils.edit_spaces import add_start_end_spaces, remove_extra_spaces
 
 
@@ -25,3 +29,33 @@ def test_remove_extra_spaces(input, expected_output):
 @pytest.mark.parametrize("input,expected_output", [("abc", " abc "), ("abc xyz", " abc xyz ")])
 def test_add_start_end_spaces(input, expected_output):
     assert add_start_end_spaces(input) == expected_output
+
+
+@pytest.mark.parametrize(
+    "content,expected_lines",
+    [
+        (b"", []),
+        (b'{"a": 1}\n{"a": 2}\n', [b'{"a": 1}\n', b'{"a": 2}\n']),
+        (b'{"a": 1}\n{"a": 2}', [b'{"a": 1}\n', b'{"a": 2}']),  # no trailing newline
+    ],
+)
+def test_iter_mmap_lines(tmp_path, content, expected_lines):
+    path = tmp_path / "manifest.json"
+    path.write_bytes(content)
+    assert list(iter_mmap_lines(path)) == expected_lines
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="named pipes are not supported on this platform")
+def test_iter_mmap_lines_fifo(tmp_path):
+    path = tmp_path / "manifest.fifo"
+    os.mkfifo(path)
+
+    def write_fifo():
+        with open(path, "wb") as fout:
+            fout.write(b'{"a": 1}\n{"a": 2}')
+
+    writer = threading.Thread(target=write_fifo)
+    writer.start()
+    lines = list(iter_mmap_lines(path))
+    writer.join()
+    assert lines == [b'{"a": 1}\n', b'{"a": 2}']